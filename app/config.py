@@ -5,51 +5,55 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-# Global config cache
-_config_cache = None
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def _load_config() -> dict:
-    """Load configuration from YAML file with caching."""
-    global _config_cache
-    if _config_cache is None:
-        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
-        try:
-            with open(config_path, 'r') as f:
-                _config_cache = yaml.safe_load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                f"Configuration file not found at {config_path}. "
-                "Please create config.yaml from config.yaml.example"
-            )
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML in config.yaml: {e}")
-    return _config_cache
+    """Load configuration from the YAML file."""
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+    try:
+        with open(config_path, 'r') as f:
+            return yaml.load(f, Loader=YAML_LOADER)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Configuration file not found at {config_path}. "
+            "Please create config.yaml from config.yaml.example"
+        )
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in config.yaml: {e}")
 
 
 def get_config() -> dict:
     """Get the full configuration dictionary."""
-    return _load_config()
+    return CONFIG
 
 
+# Parsed configuration, loaded once at import
+CONFIG = _load_config()
+
 # Application settings
-config = _load_config()
-APP_PASSWORD = config.get("application", {}).get("password")
+application_config = CONFIG.get("application", {})
+APP_PASSWORD = application_config.get("password")
 if not APP_PASSWORD:
     raise ValueError("application.password is not set in config.yaml")
 
 # Branding (with default)
-BRANDING = config.get("application", {}).get("branding", "Radio Bot")
+BRANDING = application_config.get("branding", "Radio Bot")
+
+# Internal nginx location that serves the recordings folder (optional). When
+# set, /play responses hand the file to nginx via X-Accel-Redirect.
+ACCEL_REDIRECT_PREFIX = application_config.get("accel_redirect_prefix")
 
 
 # API credentials
-DEEPGRAM_API_KEY = config.get("apis", {}).get("deepgram_api_key")
+DEEPGRAM_API_KEY = CONFIG.get("apis", {}).get("deepgram_api_key")
 if not DEEPGRAM_API_KEY:
     raise ValueError("apis.deepgram_api_key is not set in config.yaml")
 
 
 # Radio settings validation
-radio_config = config.get("radio", {})
+radio_config = CONFIG.get("radio", {})
 if not radio_config.get("frequency"):
     raise ValueError("radio.frequency is not set in config.yaml")
 if radio_config.get("gain") is None:
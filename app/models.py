@@ -1,104 +1,252 @@
 """Database models and operations."""
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+from app.utils import parse_date_from_filename
+
 DATABASE_FILE = "transcripts.db"
 
+# One connection for the whole process, opened lazily. Under eventlet every
+# greenlet counts as a thread, so per-thread connections would mean one per
+# request; a single connection behind a lock avoids reopening it each time
+_conn = None
+_conn_lock = threading.RLock()
+
 
+@contextmanager
 def get_db_connection():
-    """Create a database connection."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Hold the shared database connection, creating it on first use."""
+    global _conn
+    with _conn_lock:
+        if _conn is None:
+            conn = sqlite3.connect(DATABASE_FILE, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            # WAL keeps readers unblocked while transcripts are written and needs fewer fsyncs
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA mmap_size=268435456')
+            _conn = conn
+        yield _conn
+
+
+@contextmanager
+def _transaction(conn):
+    """Run the enclosed statements in an explicit write transaction."""
+    conn.execute('BEGIN')
+    try:
+        yield
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+
+def _date_for_filename(filename):
+    """Get the YYYYMMDD recording date for a stored transcript filename."""
+    date = parse_date_from_filename(os.path.basename(filename))
+    if date:
+        return date
+    # Fall back to the date folder the recording was organized into
+    folder = os.path.basename(os.path.dirname(filename))
+    return folder if len(folder) == 8 and folder.isdigit() else None
+
+
+def _fts_query(search_string):
+    """Quote a user search string as an FTS5 phrase, prefix-matching the last word."""
+    return '"' + search_string.replace('"', '""') + '"*'
 
 
 def init_db():
     """Initialize the database with required tables."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        with _transaction(conn):
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    filename TEXT UNIQUE NOT NULL,
+                    transcript TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    date TEXT
+                )
+            ''')
+
+            # Databases created before the date column existed need it added and backfilled
+            columns = [row['name'] for row in cursor.execute('PRAGMA table_info(transcripts)')]
+            if 'date' not in columns:
+                cursor.execute('ALTER TABLE transcripts ADD COLUMN date TEXT')
+                rows = cursor.execute('SELECT id, filename FROM transcripts').fetchall()
+                cursor.executemany(
+                    'UPDATE transcripts SET date = ? WHERE id = ?',
+                    [(_date_for_filename(row['filename']), row['id']) for row in rows]
+                )
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_filename ON transcripts (filename)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_date ON transcripts (date)
+            ''')
+
+            # Full-text index over transcripts, kept in sync by triggers
+            fts_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transcripts_fts'"
+            ).fetchone()
+
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts
+                USING fts5(transcript, content='transcripts', content_rowid='id')
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS transcripts_ai AFTER INSERT ON transcripts BEGIN
+                    INSERT INTO transcripts_fts (rowid, transcript) VALUES (new.id, new.transcript);
+                END
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS transcripts_ad AFTER DELETE ON transcripts BEGIN
+                    INSERT INTO transcripts_fts (transcripts_fts, rowid, transcript)
+                    VALUES ('delete', old.id, old.transcript);
+                END
+            ''')
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS transcripts_au AFTER UPDATE ON transcripts BEGIN
+                    INSERT INTO transcripts_fts (transcripts_fts, rowid, transcript)
+                    VALUES ('delete', old.id, old.transcript);
+                    INSERT INTO transcripts_fts (rowid, transcript) VALUES (new.id, new.transcript);
+                END
+            ''')
+
+            if not fts_exists:
+                cursor.execute("INSERT INTO transcripts_fts (transcripts_fts) VALUES ('rebuild')")
+
+
+# Upsert rather than INSERT OR REPLACE: REPLACE deletes rows without firing
+# the delete trigger, which would leave stale entries in transcripts_fts
+_UPSERT_TRANSCRIPT = '''
+    INSERT INTO transcripts (filename, transcript, response, timestamp, date)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (filename) DO UPDATE SET
+        transcript = excluded.transcript,
+        response = excluded.response,
+        timestamp = excluded.timestamp,
+        date = excluded.date
+'''
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS transcripts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            filename TEXT UNIQUE NOT NULL,
-            transcript TEXT NOT NULL,
-            response TEXT NOT NULL,
-            timestamp TEXT NOT NULL
-        )
-    ''')
 
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_filename ON transcripts (filename)
-    ''')
+def save_transcript(filename, transcript, api_response):
+    """Save or update a transcript in the database."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    conn.commit()
-    conn.close()
+        with _transaction(conn):
+            cursor.execute(
+                _UPSERT_TRANSCRIPT,
+                (filename, transcript, api_response, timestamp, _date_for_filename(filename))
+            )
 
 
-def save_transcript(filename, transcript, api_response):
-    """Save or update a transcript in the database."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def save_transcripts_many(rows):
+    """Save or update many transcripts in a single transaction.
 
-    cursor.execute('''
-        INSERT OR REPLACE INTO transcripts (filename, transcript, response, timestamp)
-        VALUES (?, ?, ?, ?)
-    ''', (filename, transcript, api_response, timestamp))
+    Args:
+        rows: Iterable of (filename, transcript, api_response) tuples
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    conn.commit()
-    conn.close()
+        with _transaction(conn):
+            cursor.executemany(_UPSERT_TRANSCRIPT, [
+                (filename, transcript, api_response, timestamp, _date_for_filename(filename))
+                for filename, transcript, api_response in rows
+            ])
 
 
 def get_transcript(filename):
     """Get a transcript by filename."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT transcript FROM transcripts WHERE filename = ?', (filename,))
-    result = cursor.fetchone()
-    conn.close()
-    return result['transcript'] if result else None
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT transcript FROM transcripts WHERE filename = ?', (filename,))
+        result = cursor.fetchone()
+        return result['transcript'] if result else None
 
 
 def list_transcripts(date=None):
     """List all transcripts, optionally filtered by date."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-    if date:
-        query = 'SELECT * FROM transcripts WHERE filename LIKE ? ORDER BY timestamp DESC'
-        cursor.execute(query, (f'%{date}%',))
-    else:
-        cursor.execute('SELECT * FROM transcripts ORDER BY timestamp DESC')
+        if date:
+            query = 'SELECT * FROM transcripts WHERE date = ? ORDER BY timestamp DESC'
+            cursor.execute(query, (date,))
+        else:
+            cursor.execute('SELECT * FROM transcripts ORDER BY timestamp DESC')
 
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+        results = [dict(row) for row in cursor.fetchall()]
+        return results
 
 
 def list_transcripts_filenames(date=None):
     """List all transcript filenames, optionally filtered by date."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    if date:
-        query = 'SELECT filename FROM transcripts WHERE filename LIKE ? ORDER BY timestamp DESC'
-        cursor.execute(query, (f'%{date}%',))
-    else:
-        cursor.execute('SELECT filename FROM transcripts ORDER BY timestamp DESC')
-
-    results = [row['filename'] for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        if date:
+            query = 'SELECT filename FROM transcripts WHERE date = ? ORDER BY timestamp DESC'
+            cursor.execute(query, (date,))
+        else:
+            cursor.execute('SELECT filename FROM transcripts ORDER BY timestamp DESC')
+
+        results = [row['filename'] for row in cursor.fetchall()]
+        return results
+
+
+def filter_missing_transcripts(filenames):
+    """Return the given filenames that have no transcript, preserving their order."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('CREATE TEMP TABLE IF NOT EXISTS candidates (path TEXT PRIMARY KEY)')
+
+        with _transaction(conn):
+            cursor.execute('DELETE FROM candidates')
+            cursor.executemany(
+                'INSERT OR IGNORE INTO candidates (path) VALUES (?)',
+                ((filename,) for filename in filenames)
+            )
+
+        # Anti-join inside SQLite rather than hashing every stored filename in Python
+        cursor.execute('''
+            SELECT c.path FROM candidates c
+            LEFT JOIN transcripts t ON t.filename = c.path
+            WHERE t.filename IS NULL
+            ORDER BY c.rowid
+        ''')
+        results = [row['path'] for row in cursor.fetchall()]
+        cursor.execute('DELETE FROM candidates')
+        return results
 
 
 def search_transcripts_by_string(search_string):
     """Search transcripts by keyword."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    query = 'SELECT * FROM transcripts WHERE transcript LIKE ? ORDER BY timestamp DESC'
-    cursor.execute(query, (f'%{search_string}%',))
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        query = '''
+            SELECT t.* FROM transcripts_fts f
+            JOIN transcripts t ON t.id = f.rowid
+            WHERE transcripts_fts MATCH ?
+            ORDER BY t.timestamp DESC
+        '''
+        cursor.execute(query, (_fts_query(search_string),))
+        results = [dict(row) for row in cursor.fetchall()]
+        return results
@@ -1,12 +1,14 @@
 """Flask routes and blueprints."""
 import os
+import re
 from datetime import timedelta
+from urllib.parse import quote
 from flask import Blueprint, render_template, request, abort, send_from_directory, redirect, url_for
 from werkzeug.utils import safe_join
 from user_agents import parse
 
 import app.models as models
-from app.config import BRANDING
+from app.config import ACCEL_REDIRECT_PREFIX, BRANDING
 from app.services.radio_manager import get_radio_status
 from app.utils import (
     require_password,
@@ -21,15 +23,32 @@ from app.utils import (
     get_unit_info,
 )
 
+# Dated recording folders are named YYYYMMDD
+_DATE_FOLDER_RE = re.compile(r'[0-9]{8}')
+
 # Create blueprints
 files_bp = Blueprint('files', __name__)
 auth_bp = Blueprint('auth', __name__)
 
 
-def setup_routes(app, record_folder: str):
-    """Register blueprints and set up routes."""
+def setup_routes(app, record_folder: str, cache):
+    """Register blueprints and set up routes.
+
+    Args:
+        app: Flask application to register the blueprints on
+        record_folder: Folder containing the dated recording folders
+        cache: Flask-Caching instance used for short-lived view data
+    """
     app.config['RECORD_FOLDER'] = record_folder
 
+    @cache.memoize(timeout=5)
+    def cached_radio_status():
+        """Get the radio status, shared across index loads for a few seconds."""
+        status = get_radio_status()
+        # The cache pickles values, which a read-only mapping doesn't support
+        status["config"] = dict(status["config"])
+        return status
+
     @auth_bp.route("/login", methods=["GET", "POST"])
     def login():
         """Handle user login."""
@@ -52,14 +71,12 @@ def setup_routes(app, record_folder: str):
         """List all recording dates."""
         record_folder = app.config['RECORD_FOLDER']
 
-        date_dirs = [
-            d for d in os.listdir(record_folder)
-            if os.path.isdir(os.path.join(record_folder, d))
-        ]
+        with os.scandir(record_folder) as entries:
+            date_dirs = [entry.name for entry in entries if entry.is_dir()]
         date_dirs.sort(reverse=True)
 
         date_info = [(date, format_date_display(date)) for date in date_dirs]
-        radio_status = get_radio_status()
+        radio_status = cached_radio_status()
         return render_template("index.html", date_info=date_info, branding=BRANDING, radio_status=radio_status)
 
     @files_bp.route("/files/<date>")
@@ -81,13 +98,17 @@ def setup_routes(app, record_folder: str):
             for t in transcripts
         }
 
-        files = []
-        for filename in sorted(os.listdir(folder_path), reverse=True):
-            if not filename.endswith(".wav"):
-                continue
+        with os.scandir(folder_path) as entries:
+            wav_entries = [
+                entry for entry in entries
+                if entry.name.endswith(".wav") and entry.is_file()
+            ]
+        wav_entries.sort(key=lambda entry: entry.name, reverse=True)
 
-            file_path = os.path.join(folder_path, filename)
-            file_length = get_wav_length(file_path)
+        files = []
+        for entry in wav_entries:
+            filename = entry.name
+            file_length = get_wav_length(entry.path, entry.stat())
 
             if file_length < 0.5:
                 continue
@@ -120,6 +141,9 @@ def setup_routes(app, record_folder: str):
         """Serve an audio file."""
         record_folder = app.config['RECORD_FOLDER']
 
+        if not _DATE_FOLDER_RE.fullmatch(date):
+            abort(400, "Invalid date")
+
         if "/" in filename or "\\" in filename:
             abort(400, "Invalid filename")
 
@@ -129,10 +153,22 @@ def setup_routes(app, record_folder: str):
         if not safe_path:
             abort(400, "Invalid path")
 
-        if not os.path.isfile(safe_path):
-            abort(404, "File not found")
-
-        return send_from_directory(folder_path, filename)
+        if ACCEL_REDIRECT_PREFIX:
+            # nginx streams the file itself from its internal location once
+            # the password check above has passed. nginx decodes this URI, so
+            # quote the filename in case it holds %, #, ? or spaces
+            response = app.response_class(mimetype="audio/wav")
+            accel_path = f"{quote(date, safe='')}/{quote(filename, safe='')}"
+            response.headers["X-Accel-Redirect"] = f"{ACCEL_REDIRECT_PREFIX.rstrip('/')}/{accel_path}"
+            return response
+
+        # send_from_directory responds with 404 itself when the file is missing
+        response = send_from_directory(folder_path, filename)
+        # Recordings never change once organized, but they sit behind the
+        # password, so only the browser may cache them, not shared proxies
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
 
     @files_bp.route("/search")
     @files_bp.route("/search/<query>")
@@ -1,14 +1,18 @@
 """File organizer service - moves files from temp to organized date folders."""
+import errno
 import os
 import shutil
 import logging
 import threading
 import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from pathlib import Path
-from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
-from app.services.file_processor import process_file, set_socketio as set_processor_socketio
+from app.services.observer import schedule
+from app.services.file_processor import process_file_batch, set_socketio as set_processor_socketio
+from app.utils import parse_date_from_filename
 
 logger = logging.getLogger(__name__)
 
@@ -17,69 +21,35 @@ TEMP_FOLDER = "temp"
 FILES_FOLDER = "files"
 
 # File monitoring globals
-observer_thread = None
+temp_watch = None
 observer_lock = threading.Lock()
 
 # Track recently processed files to prevent duplicates
-processed_files = {}
+processed_files: OrderedDict[str, float] = OrderedDict()
 processed_files_lock = threading.Lock()
 PROCESSING_WINDOW = 2  # seconds to consider a file as "recently processed"
 
 
-def set_socketio(app_socketio):
-    """Set the socketio instance for emitting events."""
-    set_processor_socketio(app_socketio)
-
-
-def parse_date_from_filename(filename: str) -> str | None:
-    """
-    Extract date from filename timestamp.
-
-    Example: 20251113_200214_26522_DMR_CC_3_GROUP_TGT_1_SRC_1.wav
-    Returns: 20251113
-
-    Args:
-        filename: The filename to parse
-
-    Returns:
-        Date string in YYYYMMDD format or None if invalid
-    """
-    try:
-        # Split filename and get first part (timestamp)
-        parts = filename.split("_")
-        if len(parts) < 2:
-            return None
-
-        timestamp = parts[0]
-
-        # Validate timestamp format (YYYYMMDD)
-        if len(timestamp) != 8:
-            return None
-
-        # Basic validation: check if it's all digits
-        if not timestamp.isdigit():
-            return None
+@dataclass(frozen=True)
+class BatchConfig:
+    """How new files are grouped before being organized and processed."""
+    batch_size: int = 50  # flush as soon as this many files are waiting
+    flush_ms: int = 500  # or once the oldest waiting file is this old
 
-        # Validate year, month, day ranges
-        year = int(timestamp[:4])
-        month = int(timestamp[4:6])
-        day = int(timestamp[6:8])
 
-        if year < 2000 or year > 2100:
-            return None
-        if month < 1 or month > 12:
-            return None
-        if day < 1 or day > 31:
-            return None
+# Files detected in temp, waiting for the flush thread
+batch_config = BatchConfig()
+pending_files: deque[str] = deque()
+pending_files_cond = threading.Condition()
+flush_thread = None
 
-        return timestamp
 
-    except (ValueError, IndexError) as e:
-        logger.error(f"Error parsing date from filename {filename}: {e}")
-        return None
+def set_socketio(app_socketio):
+    """Set the socketio instance for emitting events."""
+    set_processor_socketio(app_socketio)
 
 
-def organize_file(file_path: str) -> bool:
+def move_to_date_folder(file_path: str) -> str | None:
     """
     Move file from temp to files/YYYYMMDD/ folder.
 
@@ -87,25 +57,21 @@ def organize_file(file_path: str) -> bool:
         file_path: Full path to the file in temp folder
 
     Returns:
-        True if file was moved successfully, False otherwise
+        Path of the moved file, or None if it was not moved
     """
     try:
         # Check if file was recently processed to prevent duplicates
         with processed_files_lock:
             current_time = time.time()
 
-            # Clean up old entries
-            expired_files = [
-                f for f, t in processed_files.items()
-                if current_time - t > PROCESSING_WINDOW
-            ]
-            for f in expired_files:
-                del processed_files[f]
+            # Clean up old entries (oldest first, so stop at the first fresh one)
+            while processed_files and current_time - next(iter(processed_files.values())) > PROCESSING_WINDOW:
+                processed_files.popitem(last=False)
 
             # Check if this file was recently processed
             if file_path in processed_files:
                 logger.debug(f"Skipping duplicate processing of {file_path}")
-                return False
+                return None
 
             # Mark file as being processed
             processed_files[file_path] = current_time
@@ -113,7 +79,7 @@ def organize_file(file_path: str) -> bool:
         # Check if source file exists
         if not os.path.exists(file_path):
             logger.debug(f"File no longer exists (likely already moved): {file_path}")
-            return False
+            return None
 
         filename = os.path.basename(file_path)
 
@@ -121,7 +87,7 @@ def organize_file(file_path: str) -> bool:
         date_str = parse_date_from_filename(filename)
         if not date_str:
             logger.warning(f"Could not parse date from filename: {filename}")
-            return False
+            return None
 
         # Create target directory path
         target_dir = os.path.join(FILES_FOLDER, date_str)
@@ -130,28 +96,84 @@ def organize_file(file_path: str) -> bool:
         # Move file to target directory
         target_path = os.path.join(target_dir, filename)
 
-        # Check if file already exists
-        if os.path.exists(target_path):
-            logger.warning(f"File already exists at {target_path}, overwriting...")
-
-        shutil.move(file_path, target_path)
+        # Rename in place when temp and files share a filesystem (atomic, and
+        # overwrites any existing target); copy across filesystems otherwise
+        try:
+            os.replace(file_path, target_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(file_path, target_path)
         logger.info(f"Moved {filename} -> {target_dir}/")
-
-        # Process the file after moving
-        process_file(target_path, emit_event=True)
-
-        return True
+        return target_path
 
     except Exception as e:
         logger.error(f"Error organizing file {file_path}: {e}", exc_info=True)
-        return False
+        return None
+
+
+def organize_files(file_paths: list) -> int:
+    """
+    Move a batch of files to their date folders, then process them together.
+
+    The moved files are transcribed concurrently, saved in one transaction and
+    queued to be announced to clients in batched 'files_added' events.
+
+    Args:
+        file_paths: Full paths to files in the temp folder
+
+    Returns:
+        Number of files that were moved
+    """
+    moved = [target for target in map(move_to_date_folder, file_paths) if target]
+    if moved:
+        try:
+            process_file_batch(moved, emit_event=True)
+        except Exception as e:
+            logger.error(f"Error processing organized files: {e}", exc_info=True)
+    return len(moved)
+
+
+def enqueue_file(file_path: str):
+    """Queue a file in temp to be organized by the next batch flush."""
+    with pending_files_cond:
+        pending_files.append(file_path)
+        pending_files_cond.notify()
+
+
+def _flush_loop():
+    """Organize queued files in batches, for as long as the process runs."""
+    while True:
+        with pending_files_cond:
+            while not pending_files:
+                pending_files_cond.wait()
+
+            # Give the batch until the flush interval to fill up
+            deadline = time.monotonic() + batch_config.flush_ms / 1000
+            while len(pending_files) < batch_config.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                pending_files_cond.wait(remaining)
+
+            count = min(batch_config.batch_size, len(pending_files))
+            batch = [pending_files.popleft() for _ in range(count)]
+
+        try:
+            organize_files(batch)
+        except Exception as e:
+            logger.error(f"Error flushing organizer batch: {e}", exc_info=True)
 
 
 class FileOrganizerHandler(FileSystemEventHandler):
     """Handles file system events for the temp folder."""
 
-    def on_created(self, event):
-        """Handle file creation events."""
+    def on_closed(self, event):
+        """Handle files closed after writing (dsd-fme finished a recording).
+
+        Waiting for the close instead of the creation means a recording is
+        never moved or transcribed while dsd-fme is still writing it.
+        """
         if event.is_directory:
             return
 
@@ -159,7 +181,7 @@ class FileOrganizerHandler(FileSystemEventHandler):
             return
 
         logger.info(f"New file detected: {event.src_path}")
-        organize_file(event.src_path)
+        enqueue_file(event.src_path)
 
     def on_moved(self, event):
         """Handle file move events (files moved into temp folder)."""
@@ -170,29 +192,20 @@ class FileOrganizerHandler(FileSystemEventHandler):
             return
 
         logger.info(f"File moved into temp: {event.dest_path}")
-        organize_file(event.dest_path)
+        enqueue_file(event.dest_path)
 
 
 def start_watching_temp():
     """Start watching the temp folder for new files."""
-    with observer_lock:
-        try:
-            # Create temp and files folders if they don't exist
-            os.makedirs(TEMP_FOLDER, exist_ok=True)
-            os.makedirs(FILES_FOLDER, exist_ok=True)
-
-            event_handler = FileOrganizerHandler()
-            observer = Observer()
-            observer.schedule(event_handler, path=TEMP_FOLDER, recursive=False)
-            observer.start()
-            logger.info(f"Watching temp folder: {TEMP_FOLDER}")
-            observer.join()
-        except KeyboardInterrupt:
-            observer.stop()
-        except Exception as e:
-            logger.error(f"File watching error: {e}", exc_info=True)
-        finally:
-            observer.join()
+    global temp_watch
+    try:
+        # Create temp and files folders if they don't exist
+        os.makedirs(TEMP_FOLDER, exist_ok=True)
+        os.makedirs(FILES_FOLDER, exist_ok=True)
+
+        temp_watch = schedule(FileOrganizerHandler(), TEMP_FOLDER, recursive=False)
+    except Exception as e:
+        logger.error(f"File watching error: {e}", exc_info=True)
 
 
 def organize_existing_files():
@@ -211,10 +224,9 @@ def organize_existing_files():
         logger.info(f"Found {len(files)} existing files in temp folder")
 
         success_count = 0
-        for filename in files:
-            file_path = os.path.join(TEMP_FOLDER, filename)
-            if organize_file(file_path):
-                success_count += 1
+        for start in range(0, len(files), batch_config.batch_size):
+            chunk = files[start:start + batch_config.batch_size]
+            success_count += organize_files([os.path.join(TEMP_FOLDER, filename) for filename in chunk])
 
         logger.info(f"Organized {success_count}/{len(files)} existing files")
 
@@ -222,19 +234,23 @@ def organize_existing_files():
         logger.error(f"Error organizing existing files: {e}", exc_info=True)
 
 
-def start_organizer_thread():
-    """Start file organizer thread."""
-    global observer_thread
+def start_organizer_thread(config: BatchConfig | None = None):
+    """Organize existing files and start watching the temp folder.
+
+    Args:
+        config: Batching used for new files (defaults to BatchConfig())
+    """
+    global batch_config, flush_thread
     with observer_lock:
-        if observer_thread is None or not observer_thread.is_alive():
+        if temp_watch is None:
+            if config is not None:
+                batch_config = config
+
             # First organize existing files
             organize_existing_files()
 
-            # Then start watching
-            observer_thread = threading.Thread(
-                target=start_watching_temp,
-                name="FileOrganizerThread",
-                daemon=True
-            )
-            observer_thread.start()
-            logger.info("File organizer thread started")
+            # Then start the batch flusher and watch on the shared observer
+            flush_thread = threading.Thread(target=_flush_loop, name="FileOrganizerFlush", daemon=True)
+            flush_thread.start()
+            start_watching_temp()
+            logger.info("File organizer started")
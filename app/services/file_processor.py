@@ -1,10 +1,12 @@
 """File processing service - core logic for handling new recordings."""
 import os
 import logging
+import threading
+from collections import deque
 from datetime import timedelta
 
-from app.models import get_transcript
-from app.services.transcription import save_transcription
+from app.models import get_transcript, save_transcripts_many
+from app.services.transcription import save_transcription, transcribe_many
 from app.services.notifications import check_transcript_for_alerts
 from app.utils import (
     parse_time_from_filename,
@@ -18,13 +20,48 @@ logger = logging.getLogger(__name__)
 # Global socketio instance
 _socketio = None
 
+# New-file events waiting for the emitter task; the oldest are dropped if the
+# emitter falls this far behind
+EMIT_QUEUE_SIZE = 4096
+EMIT_BATCH_SIZE = 64  # most files announced in a single 'files_added' event
+_emit_queue: deque[dict] = deque(maxlen=EMIT_QUEUE_SIZE)
+_emit_ready = threading.Event()
+
+# Files process_file_batch() transcribes and saves together before moving on
+PROCESS_CHUNK_SIZE = 50
+
 
 def set_socketio(socketio_instance):
-    """Set the socketio instance for emitting events."""
+    """Set the socketio instance and start the task that emits its events."""
     global _socketio
+    if _socketio is None:
+        socketio_instance.start_background_task(_emitter_loop)
     _socketio = socketio_instance
 
 
+def _queue_file_events(payloads: list):
+    """Hand new-file payloads to the emitter task instead of emitting inline."""
+    if _socketio is None:
+        return
+    _emit_queue.extend(payloads)
+    _emit_ready.set()
+
+
+def _emitter_loop():
+    """Emit queued new-file payloads in batches as 'files_added' events."""
+    while True:
+        _emit_ready.wait()
+        _emit_ready.clear()
+
+        while _emit_queue:
+            count = min(EMIT_BATCH_SIZE, len(_emit_queue))
+            batch = [_emit_queue.popleft() for _ in range(count)]
+            try:
+                _socketio.emit('files_added', batch)
+            except Exception as e:
+                logger.error(f"Error emitting WebSocket event: {e}", exc_info=True)
+
+
 def get_file_data(file_path: str) -> dict | None:
     """
     Extract metadata from a file without saving to DB or sending notifications.
@@ -74,6 +111,18 @@ def get_file_data(file_path: str) -> dict | None:
         return None
 
 
+def _event_payload(file_data: dict, transcript: str | None) -> dict:
+    """Build the WebSocket payload describing a newly added file."""
+    return {
+        'filename': file_data['filename'],
+        'formatted_time': file_data['formatted_time'],
+        'duration': file_data['duration'],
+        'transcript': transcript,
+        'folder_name': file_data['folder_name'],
+        'unit_name': file_data['unit_name']
+    }
+
+
 def process_file(file_path: str, emit_event: bool = True) -> bool:
     """
     Process a new recording file.
@@ -105,18 +154,8 @@ def process_file(file_path: str, emit_event: bool = True) -> bool:
     transcript = get_transcript(file_path)
 
     # Step 3: Emit WebSocket event (optional)
-    if emit_event and _socketio:
-        try:
-            _socketio.emit('file_added', {
-                'filename': file_data['filename'],
-                'formatted_time': file_data['formatted_time'],
-                'duration': file_data['duration'],
-                'transcript': transcript,
-                'folder_name': file_data['folder_name'],
-                'unit_name': file_data['unit_name']
-            })
-        except Exception as e:
-            logger.error(f"Error emitting WebSocket event: {e}", exc_info=True)
+    if emit_event:
+        _queue_file_events([_event_payload(file_data, transcript)])
 
     # Step 4: Check for alerts
     if transcript:
@@ -128,12 +167,61 @@ def process_file(file_path: str, emit_event: bool = True) -> bool:
     return True
 
 
-def process_file_batch(file_paths: list) -> dict:
+def _process_chunk(file_paths: list, emit_event: bool, results: dict):
+    """Transcribe, save, announce and alert on one chunk of a batch."""
+    batch = []
+    for file_path in file_paths:
+        file_data = get_file_data(file_path)
+        if file_data is None:
+            results['skipped'] += 1
+            continue
+        batch.append(file_data)
+
+    rows = []
+    alerts = []
+    events = []
+    transcribed = transcribe_many([file_data['file_path'] for file_data in batch])
+    for file_data, row in zip(batch, transcribed):
+        if row is None:
+            results['failed'] += 1
+            # Still announce the file, as process_file does, without a transcript
+            events.append(_event_payload(file_data, None))
+            continue
+
+        rows.append(row)
+        alerts.append((row[1], file_data['unit_name']))
+        events.append(_event_payload(file_data, row[1]))
+
+    if rows:
+        save_transcripts_many(rows)
+        results['success'] += len(rows)
+        logger.info(f"Saved {len(rows)} transcripts")
+
+    if emit_event:
+        _queue_file_events(events)
+
+    for transcript, unit_name in alerts:
+        if not transcript:
+            continue
+        try:
+            check_transcript_for_alerts(transcript, unit_name)
+        except Exception as e:
+            logger.error(f"Error checking transcript for alerts: {e}", exc_info=True)
+
+
+def process_file_batch(file_paths: list, emit_event: bool = False) -> dict:
     """
-    Process multiple files in batch mode (no WebSocket events).
+    Process multiple files in batch mode.
+
+    Files are handled in chunks of PROCESS_CHUNK_SIZE: each chunk is
+    transcribed concurrently and written to the database in a single
+    transaction before the next one starts, so a large backlog is saved
+    as it goes instead of all at the end.
 
     Args:
         file_paths: List of file paths to process
+        emit_event: Whether to announce every processed file in
+            'files_added' WebSocket events
 
     Returns:
         Dict with success/failure counts
@@ -145,14 +233,7 @@ def process_file_batch(file_paths: list) -> dict:
         'skipped': 0,
     }
 
-    for file_path in file_paths:
-        if get_file_data(file_path) is None:
-            results['skipped'] += 1
-            continue
-
-        if process_file(file_path, emit_event=False):
-            results['success'] += 1
-        else:
-            results['failed'] += 1
+    for start in range(0, len(file_paths), PROCESS_CHUNK_SIZE):
+        _process_chunk(file_paths[start:start + PROCESS_CHUNK_SIZE], emit_event, results)
 
     return results
@@ -2,16 +2,16 @@
 import os
 import threading
 import logging
-from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
-from app.models import list_transcripts_filenames
+from app.services.observer import schedule
+from app.models import filter_missing_transcripts
 from app.services.file_processor import process_file, set_socketio as set_processor_socketio
 
 logger = logging.getLogger(__name__)
 
 # File monitoring globals
-observer_thread = None
+record_watch = None
 transcript_thread = None
 observer_lock = threading.Lock()
 transcript_lock = threading.Lock()
@@ -37,20 +37,24 @@ class FileChangeHandler(FileSystemEventHandler):
 
 def start_watching_folder(record_folder: str):
     """Start watching the record folder for new files."""
-    with observer_lock:
-        try:
-            event_handler = FileChangeHandler()
-            observer = Observer()
-            observer.schedule(event_handler, path=record_folder, recursive=True)
-            observer.start()
-            logger.info(f"Watching: {record_folder}")
-            observer.join()
-        except KeyboardInterrupt:
-            observer.stop()
-        except Exception as e:
-            logger.error(f"File watching error: {e}", exc_info=True)
-        finally:
-            observer.join()
+    global record_watch
+    try:
+        record_watch = schedule(FileChangeHandler(), record_folder, recursive=True)
+    except Exception as e:
+        logger.error(f"File watching error: {e}", exc_info=True)
+
+
+def _scan_wav_files(folder: str):
+    """Recursively yield paths of WAV files under a folder using os.scandir."""
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scan_wav_files(entry.path)
+                elif entry.name.endswith(".wav") and entry.is_file():
+                    yield entry.path
+    except OSError as e:
+        logger.warning(f"Could not scan {folder}: {e}")
 
 
 def create_missing_transcripts(record_folder: str):
@@ -61,16 +65,10 @@ def create_missing_transcripts(record_folder: str):
         try:
             logger.info("Checking for missing transcripts...")
 
-            existing = set(list_transcripts_filenames())
-            logger.info(f"Found {len(existing)} existing transcripts")
+            wav_files = list(_scan_wav_files(record_folder))
+            logger.info(f"Found {len(wav_files)} recordings")
 
-            files_to_transcribe = []
-            for root, dirs, files in os.walk(record_folder):
-                for file in files:
-                    if file.endswith(".wav"):
-                        full_path = os.path.join(root, file)
-                        if full_path not in existing:
-                            files_to_transcribe.append(full_path)
+            files_to_transcribe = filter_missing_transcripts(wav_files)
 
             logger.info(f"Found {len(files_to_transcribe)} files needing transcription")
 
@@ -83,18 +81,11 @@ def create_missing_transcripts(record_folder: str):
 
 
 def start_observer_thread(record_folder: str):
-    """Start file observer thread."""
-    global observer_thread
+    """Start watching the record folder on the shared observer."""
     with observer_lock:
-        if observer_thread is None or not observer_thread.is_alive():
-            observer_thread = threading.Thread(
-                target=start_watching_folder,
-                args=(record_folder,),
-                name="FileObserverThread",
-                daemon=True
-            )
-            observer_thread.start()
-            logger.info("Observer thread started")
+        if record_watch is None:
+            start_watching_folder(record_folder)
+            logger.info("Record folder watch started")
 
 
 def start_transcript_thread(record_folder: str):
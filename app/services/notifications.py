@@ -1,45 +1,137 @@
 """Notification service for alert keywords."""
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import ahocorasick
 import requests
+from requests.adapters import HTTPAdapter
 
-from app.config import get_config
+from app.config import CONFIG
 
 logger = logging.getLogger(__name__)
 
-_notification_config_cache = None
-
-
-def _load_notification_config() -> dict:
-    """Load notification configuration from YAML file with caching."""
-    global _notification_config_cache
-    if _notification_config_cache is None:
-        try:
-            config = get_config()
-            _notification_config_cache = config.get("notifications", {})
-        except Exception as e:
-            logger.warning(f"Failed to load config.yaml for notifications: {e}")
-            _notification_config_cache = {
-                "groupme": {"enabled": False, "bot_id": None},
-                "discord": {"enabled": False, "webhook_url": None},
-                "wordlists": {"standard": {"words": []}, "strict": {"words": [], "min_occurrences": 2}}
-            }
-    return _notification_config_cache
-
-
-def check_string(string, targetedWords):
-    """Check if any target words appear in the string."""
-    lower_string = string.lower()
-    for word in targetedWords:
-        if word.lower() in lower_string:
-            return True
+# Shared HTTP session so connections to GroupMe/Discord are kept alive between alerts
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Notifications are sent off the file-processing thread
+_NOTIFY_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Notify")
+
+
+@dataclass(frozen=True)
+class NotificationConfig:
+    """Notification settings, flattened and normalized once at load time."""
+    standard_words: tuple[str, ...]
+    strict_words: tuple[str, ...]
+    min_occurrences: int
+    groupme_enabled: bool
+    groupme_bot_id: str | None
+    discord_enabled: bool
+    discord_webhook_url: str | None
+
+
+def _words(wordlist) -> tuple[str, ...]:
+    """Lowercase a configured wordlist, tolerating a missing or empty list.
+
+    Entries YAML parses as numbers (e.g. an unquoted 911) become strings.
+    """
+    words = (wordlist or {}).get("words") or []
+    return tuple(str(w).lower() for w in words if w is not None)
+
+
+def _load_notification_config() -> NotificationConfig:
+    """Build the notification configuration from config.yaml.
+
+    A malformed notifications section disables alerts instead of stopping
+    the server from starting.
+    """
+    try:
+        config = CONFIG.get("notifications") or {}
+
+        wordlists = config.get("wordlists") or {}
+        strict_config = wordlists.get("strict") or {}
+        groupme_config = config.get("groupme") or {}
+        discord_config = config.get("discord") or {}
+        min_occurrences = strict_config.get("min_occurrences")
+        # A strict keyword has to actually appear; 0 or less is treated as 1
+        min_occurrences = 2 if min_occurrences is None else max(1, int(min_occurrences))
+
+        # Lowercase word lists up-front so matching doesn't redo it per transcript
+        return NotificationConfig(
+            standard_words=_words(wordlists.get("standard")),
+            strict_words=_words(strict_config),
+            min_occurrences=min_occurrences,
+            groupme_enabled=bool(groupme_config.get("enabled", False)),
+            groupme_bot_id=groupme_config.get("bot_id"),
+            discord_enabled=bool(discord_config.get("enabled", False)),
+            discord_webhook_url=discord_config.get("webhook_url"),
+        )
+    except Exception as e:
+        logger.error(f"Invalid notifications config in config.yaml, alerts disabled: {e}")
+        return NotificationConfig(
+            standard_words=(),
+            strict_words=(),
+            min_occurrences=2,
+            groupme_enabled=False,
+            groupme_bot_id=None,
+            discord_enabled=False,
+            discord_webhook_url=None,
+        )
+
+
+def _build_automaton(words: tuple[str, ...]):
+    """Build an Aho-Corasick automaton over the given (lowercased) keywords.
+
+    Each keyword maps to ``(index, length)`` so matches can be tallied per word.
+    Returns None when there are no keywords to match.
+    """
+    automaton = ahocorasick.Automaton()
+    for index, word in enumerate(words):
+        if word:
+            automaton.add_word(word, (index, len(word)))
+
+    if len(automaton) == 0:
+        return None
+
+    automaton.make_automaton()
+    return automaton
+
+
+NOTIFICATION_CONFIG = _load_notification_config()
+ALERT_STANDARD_LOWER: tuple[str, ...] = NOTIFICATION_CONFIG.standard_words
+ALERT_STRICT_LOWER: tuple[str, ...] = NOTIFICATION_CONFIG.strict_words
+MIN_OCCURRENCES: int = NOTIFICATION_CONFIG.min_occurrences
+
+# Keyword matchers, built once so each transcript is scanned in a single pass
+_STANDARD_AUTOMATON = _build_automaton(ALERT_STANDARD_LOWER)
+_STRICT_AUTOMATON = _build_automaton(ALERT_STRICT_LOWER)
+
+
+def check_string(lower_string, automaton):
+    """Check if any keyword in the automaton appears in the already-lowercased string."""
+    if automaton is None:
+        return False
+    for _ in automaton.iter(lower_string):
+        return True
     return False
 
 
-def check_string_min_occurrences(string, targetedWords, min_occurrences=2):
-    """Check if target words appear a minimum number of times."""
-    lower_string = string.lower()
-    for word in targetedWords:
-        if lower_string.count(word.lower()) >= min_occurrences:
+def check_string_min_occurrences(lower_string, automaton, min_occurrences=2):
+    """Check if any keyword appears a minimum number of times in the already-lowercased string."""
+    if automaton is None:
+        return False
+
+    counts = Counter()
+    last_end = {}
+    for end, (index, length) in automaton.iter(lower_string):
+        # Only count non-overlapping occurrences, matching str.count()
+        if end - length < last_end.get(index, -1):
+            continue
+        last_end[index] = end
+        counts[index] += 1
+        if counts[index] >= min_occurrences:
             return True
     return False
 
@@ -52,7 +144,7 @@ def send_groupme_message(bot_id, message, unit_name):
     try:
         final_message = f"{message}\n\n[From: {unit_name}]"
         body = {"text": final_message, "bot_id": bot_id}
-        requests.post("https://api.groupme.com/v3/bots/post", json=body, timeout=5)
+        _SESSION.post("https://api.groupme.com/v3/bots/post", json=body, timeout=5)
         logger.info(f"GroupMe notification sent for unit: {unit_name}")
     except Exception as e:
         logger.error(f"GroupMe notification failed: {e}")
@@ -66,7 +158,7 @@ def send_discord_message(webhook_url, message, unit_name):
     try:
         final_message = f"{message}\n\n[From: {unit_name}]"
         body = {"content": final_message}
-        requests.post(webhook_url, json=body, timeout=5)
+        _SESSION.post(webhook_url, json=body, timeout=5)
         logger.info(f"Discord notification sent for unit: {unit_name}")
     except Exception as e:
         logger.error(f"Discord notification failed: {e}")
@@ -74,31 +166,26 @@ def send_discord_message(webhook_url, message, unit_name):
 
 def check_transcript_for_alerts(message, unit_name):
     """Check transcript against alert keywords and send notifications."""
-    config = _load_notification_config()
-
-    # Get word lists from config
-    wordlists = config.get("wordlists", {})
-    standard_wordlist = wordlists.get("standard", {}).get("words", [])
-    strict_wordlist_config = wordlists.get("strict", {})
-    strict_wordlist = strict_wordlist_config.get("words", [])
-    min_occurrences = strict_wordlist_config.get("min_occurrences", 2)
+    if _STANDARD_AUTOMATON is None and _STRICT_AUTOMATON is None:
+        return
 
     # Check if message matches any alert criteria
+    lower_message = message.lower()
     alert_triggered = (
-        check_string(message, standard_wordlist) or
-        check_string_min_occurrences(message, strict_wordlist, min_occurrences)
+        check_string(lower_message, _STANDARD_AUTOMATON) or
+        check_string_min_occurrences(lower_message, _STRICT_AUTOMATON, MIN_OCCURRENCES)
     )
 
     if not alert_triggered:
         return
 
     # Send notifications based on enabled services
-    groupme_config = config.get("groupme", {})
-    if groupme_config.get("enabled", False):
-        bot_id = groupme_config.get("bot_id")
-        send_groupme_message(bot_id, message, unit_name)
-
-    discord_config = config.get("discord", {})
-    if discord_config.get("enabled", False):
-        webhook_url = discord_config.get("webhook_url")
-        send_discord_message(webhook_url, message, unit_name)
+    if NOTIFICATION_CONFIG.groupme_enabled:
+        _NOTIFY_EXECUTOR.submit(
+            send_groupme_message, NOTIFICATION_CONFIG.groupme_bot_id, message, unit_name
+        )
+
+    if NOTIFICATION_CONFIG.discord_enabled:
+        _NOTIFY_EXECUTOR.submit(
+            send_discord_message, NOTIFICATION_CONFIG.discord_webhook_url, message, unit_name
+        )
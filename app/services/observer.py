@@ -0,0 +1,48 @@
+"""Shared watchdog observer used by all file system monitoring services."""
+import logging
+import threading
+from watchdog.observers import Observer
+
+logger = logging.getLogger(__name__)
+
+# A single observer thread dispatches events for every watched folder
+_observer = None
+_observer_lock = threading.Lock()
+
+
+def get_observer() -> Observer:
+    """Get the shared observer, starting it on first use."""
+    global _observer
+    with _observer_lock:
+        if _observer is None:
+            _observer = Observer()
+            _observer.start()
+            logger.info("File observer started")
+    return _observer
+
+
+def schedule(event_handler, path: str, recursive: bool = False):
+    """Watch a path with the shared observer.
+
+    Args:
+        event_handler: watchdog event handler to dispatch events to
+        path: Folder to watch
+        recursive: Whether to watch subfolders as well
+
+    Returns:
+        The watchdog ObservedWatch for the path
+    """
+    watch = get_observer().schedule(event_handler, path=path, recursive=recursive)
+    logger.info(f"Watching: {path}")
+    return watch
+
+
+def stop_observer():
+    """Stop the shared observer if it is running."""
+    global _observer
+    with _observer_lock:
+        if _observer is not None:
+            _observer.stop()
+            _observer.join(timeout=5)
+            _observer = None
+            logger.info("File observer stopped")
@@ -2,9 +2,9 @@
 import os
 import subprocess
 import logging
-import signal
 import time
 import threading
+from types import MappingProxyType
 from typing import Optional
 from app.config import get_config
 
@@ -14,6 +14,16 @@ logger = logging.getLogger(__name__)
 RESTART_INTERVAL = 3600  # Restart the process every hour (seconds)
 FROZEN_CHECK_INTERVAL = 30  # How often to check for frozen process (seconds)
 FROZEN_TIMEOUT = 300  # Consider process frozen if no log output for 5 minutes (seconds)
+CRASH_POLL_INTERVAL = 1  # How often the watchdog checks whether the process exited (seconds)
+
+# Shutdown settings
+STOP_TIMEOUT = 5  # Grace period after SIGTERM before force killing (seconds)
+KILL_TIMEOUT = 1  # How long to wait for the process to exit after SIGKILL (seconds)
+
+LOG_FILE = "dsd-fme.jsonl"
+
+# How often _wait_for_exit() checks whether the process has exited (seconds)
+EXIT_POLL_INTERVAL = 0.05
 
 
 class RadioManager:
@@ -24,9 +34,25 @@ class RadioManager:
         self.process: Optional[subprocess.Popen] = None
         self.config = get_config().get("radio", {})
         self._validate_config()
+        self._prepare_command()
+        # Shared by every get_status() call; read-only since callers share it
+        self._config_snapshot = MappingProxyType({
+            "frequency": self.config["frequency"],
+            "gain": self.config["gain"],
+            "device_index": self.config.get("device_index", 0),
+        })
         self._last_start_time: Optional[float] = None
         self._watchdog_thread: Optional[threading.Thread] = None
         self._watchdog_running = False
+        # Set by _stop_watchdog() to end a pending watchdog wait immediately
+        self._watchdog_stop = threading.Event()
+        self._log_file = None
+
+    def _close_log_file(self):
+        """Close the dsd-fme log file handle if one is open."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
 
     def _validate_config(self):
         """Validate required radio configuration."""
@@ -39,11 +65,11 @@ class RadioManager:
                 "Please update config.yaml with radio settings."
             )
 
-    def _build_command(self) -> list:
-        """Build the dsd-fme command from configuration.
+    def _prepare_command(self):
+        """Build the dsd-fme command from configuration once.
 
-        Returns:
-            List of command arguments for subprocess
+        The radio config doesn't change after validation, so the argv is
+        computed here and reused by every start()/restart.
         """
         # Get configuration values (only device, frequency, and gain are configurable)
         frequency = self.config["frequency"]
@@ -53,30 +79,33 @@ class RadioManager:
         # Hard-coded values for RTL-SDR input
         # Format: rtl:dev:freq:gain:ppm:bw:sq:vol
         # ppm=0, bandwidth=12, squelch=0, volume=2
-        rtl_input = f"rtl:{device_index}:{frequency}M:{gain}:0:12:0:3"
+        self._rtl_input = f"rtl:{device_index}:{frequency}M:{gain}:0:12:0:3"
 
         # Ensure directories exist
         temp_dir = "./temp"
-        for directory in [temp_dir]:
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-                logger.info(f"Created directory: {directory}")
+        os.makedirs(temp_dir, exist_ok=True)
 
         # Build command based on: dsd-fme -fs -i rtl:0:461.375M:32:0:12:0:2 -P -7 calls -Q dmr_log.jsonl -J events.txt -a -t 1 -o null
 
-        command = [
+        self._command = (
             "dsd-fme",
             "-fs",  # DMR Stereo mode
-            "-i", rtl_input,  # RTL-SDR input specification
+            "-i", self._rtl_input,  # RTL-SDR input specification
             "-P", "-7", temp_dir,  # Per-call wav files output directory
             "-Q", "dmr_log.jsonl",  # DMR log file
             "-J", "events.txt",  # Events file
             "-a",  # Auto-detect frame type
             "-t", "1",  # Frame timeout
             "-o", "null"  # No audio output (null)
-        ]
+        )
+
+    def _build_command(self) -> list:
+        """Get the dsd-fme command built from configuration.
 
-        return command
+        Returns:
+            List of command arguments for subprocess
+        """
+        return list(self._command)
 
     def start(self):
         """Start the radio monitoring process."""
@@ -84,42 +113,44 @@ class RadioManager:
             logger.warning("Radio process is already running")
             return
 
+        log_file = None
         try:
             command = self._build_command()
-            logger.info(f"Starting radio process: {' '.join(command)}")
+            logger.info("Starting radio process: %s", command)
 
             # Open log file for dsd-fme stderr output (contains main output)
-            log_file = open("dsd-fme.jsonl", "a")
+            log_file = open(LOG_FILE, "a")
 
             # Start the process
-            # Note: dsd-fme outputs to stderr, not stdout
+            # Note: dsd-fme outputs to stderr, not stdout. With "-o null" stdout
+            # carries nothing useful, and an unread pipe would eventually fill
+            # up and block the process, so discard it.
             self.process = subprocess.Popen(
                 command,
-                stdout=subprocess.PIPE,
-                stderr=log_file,
-                text=True
+                stdout=subprocess.DEVNULL,
+                stderr=log_file
             )
 
-            # Store log file handle for cleanup
-            self._log_file = log_file
-
             # Give it a moment to start
             time.sleep(1)
 
             # Check if it started successfully
             if self.process.poll() is not None:
                 # Process already exited
-                logger.error(f"Radio process failed to start. Exit code: {self.process.returncode}")
-                logger.error(f"Check dsd-fme.jsonl for details")
-                log_file.close()
+                logger.error("Radio process failed to start. Exit code: %s", self.process.returncode)
+                logger.error("Check %s for details", LOG_FILE)
                 self.process = None
                 raise RuntimeError("Failed to start radio process. Check logs for details.")
 
+            # The running process now owns the log file; stop() closes it
+            self._log_file = log_file
+            log_file = None
+
             self._last_start_time = time.time()
 
-            logger.info(f"Radio process started successfully (PID: {self.process.pid})")
-            logger.info(f"Monitoring DMR on {self.config['frequency']} MHz (gain: {self.config['gain']})")
-            logger.info(f"Logs: dsd-fme.jsonl | Call recordings: temp/")
+            logger.info("Radio process started successfully (PID: %s)", self.process.pid)
+            logger.info("Monitoring DMR on %s MHz (gain: %s)", self.config['frequency'], self.config['gain'])
+            logger.info("Logs: %s | Call recordings: temp/", LOG_FILE)
 
             # Start watchdog if not already running
             self._start_watchdog()
@@ -128,52 +159,82 @@ class RadioManager:
             logger.error("dsd-fme command not found. Please ensure it is installed and in PATH.")
             raise
         except Exception as e:
-            logger.error(f"Error starting radio process: {e}")
+            logger.error("Error starting radio process: %s", e)
             self.process = None
             raise
+        finally:
+            # Only still set if the process failed to spawn or start
+            if log_file is not None:
+                log_file.close()
 
-    def stop(self, stop_watchdog=True):
+    def stop(self, stop_watchdog=True, timeout: float = STOP_TIMEOUT):
         """Stop the radio monitoring process.
 
         Args:
             stop_watchdog: If True, also stop the watchdog thread. Set to False
                           when the watchdog itself is triggering a restart.
+            timeout: Seconds to wait after SIGTERM before sending SIGKILL.
         """
         if stop_watchdog:
             self._stop_watchdog()
 
         if not self.is_running():
             logger.warning("Radio process is not running")
+            # Release the log file left over from a process that already exited
+            self._close_log_file()
             return
 
         try:
-            logger.info(f"Stopping radio process (PID: {self.process.pid})")
+            logger.info("Stopping radio process (PID: %s)", self.process.pid)
 
             # Try graceful shutdown first
             self.process.terminate()
 
-            # Wait up to 5 seconds for graceful shutdown
-            try:
-                self.process.wait(timeout=5)
+            # Wait for graceful shutdown
+            if self._wait_for_exit(timeout):
                 logger.info("Radio process stopped gracefully")
-            except subprocess.TimeoutExpired:
+            else:
                 # Force kill if it doesn't stop gracefully
                 logger.warning("Radio process did not stop gracefully, force killing")
                 self.process.kill()
-                self.process.wait()
-                logger.info("Radio process force killed")
-
-            # Close log file if it exists
-            if hasattr(self, '_log_file') and self._log_file:
-                self._log_file.close()
-                self._log_file = None
+                if self._wait_for_exit(KILL_TIMEOUT):
+                    logger.info("Radio process force killed")
+                else:
+                    # e.g. stuck in uninterruptible USB I/O; it exits once that
+                    # returns, so don't keep treating it as the running process
+                    logger.error(
+                        "Radio process (PID: %s) did not exit %ss after SIGKILL",
+                        self.process.pid, KILL_TIMEOUT
+                    )
 
             self.process = None
             self._last_start_time = None
 
         except Exception as e:
-            logger.error(f"Error stopping radio process: {e}")
+            logger.error("Error stopping radio process: %s", e)
             raise
+        finally:
+            # Always release the log file, even if terminate() failed
+            self._close_log_file()
+
+    def _wait_for_exit(self, timeout: float) -> bool:
+        """Wait for the process to exit, reaping it if it does.
+
+        Polls instead of Popen.wait(timeout): under eventlet the green Popen
+        raises a TimeoutExpired that isn't subprocess.TimeoutExpired.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            True if the process exited within the timeout, False otherwise
+        """
+        deadline = time.monotonic() + timeout
+        while self.process.poll() is None:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(EXIT_POLL_INTERVAL)
+        return True
 
     def restart(self):
         """Restart the radio monitoring process."""
@@ -187,7 +248,13 @@ class RadioManager:
         if self._watchdog_running:
             return
 
+        # A restart performed by the watchdog itself must not spawn a second
+        # watchdog if stop() was requested meanwhile; the loop will exit instead
+        if threading.current_thread() is self._watchdog_thread:
+            return
+
         self._watchdog_running = True
+        self._watchdog_stop.clear()
         self._watchdog_thread = threading.Thread(
             target=self._watchdog_loop,
             name="RadioWatchdogThread",
@@ -202,6 +269,7 @@ class RadioManager:
             return
 
         self._watchdog_running = False
+        self._watchdog_stop.set()
         if self._watchdog_thread and self._watchdog_thread.is_alive():
             self._watchdog_thread.join(timeout=10)
         self._watchdog_thread = None
@@ -213,36 +281,55 @@ class RadioManager:
         Returns:
             True if the process appears frozen, False otherwise.
         """
-        log_file = "dsd-fme.jsonl"
         try:
-            if os.path.exists(log_file):
-                last_modified = os.path.getmtime(log_file)
-                seconds_since_update = time.time() - last_modified
-                if seconds_since_update > FROZEN_TIMEOUT:
-                    logger.warning(
-                        f"Log file hasn't been updated in {seconds_since_update:.0f}s "
-                        f"(threshold: {FROZEN_TIMEOUT}s)"
-                    )
-                    return True
+            if not os.path.exists(LOG_FILE):
+                return False
+
+            last_modified = os.path.getmtime(LOG_FILE)
+
+            seconds_since_update = time.time() - last_modified
+            if seconds_since_update > FROZEN_TIMEOUT:
+                logger.warning(
+                    "Log file hasn't been updated in %.0fs (threshold: %ss)",
+                    seconds_since_update, FROZEN_TIMEOUT
+                )
+                return True
         except OSError as e:
-            logger.error(f"Error checking log file: {e}")
+            logger.error("Error checking log file: %s", e)
 
         return False
 
+    def _watchdog_wait(self):
+        """Wait until the next watchdog check is due or the process exits.
+
+        Waits on the stop event, which _stop_watchdog() sets to end the wait
+        immediately, in CRASH_POLL_INTERVAL slices so a crashed process is
+        noticed within about a second rather than at the next check.
+        """
+        timeout = FROZEN_CHECK_INTERVAL
+        if self._last_start_time is not None:
+            uptime = time.time() - self._last_start_time
+            timeout = max(0, min(FROZEN_CHECK_INTERVAL, RESTART_INTERVAL - uptime))
+
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            if self._watchdog_stop.wait(min(CRASH_POLL_INTERVAL, remaining)):
+                return
+            process = self.process
+            if process is not None and process.poll() is not None:
+                return
+
     def _watchdog_loop(self):
         """Background loop that monitors and restarts the radio process."""
         logger.info(
-            f"Watchdog active: periodic restart every {RESTART_INTERVAL}s, "
-            f"frozen detection after {FROZEN_TIMEOUT}s of inactivity"
+            "Watchdog active: periodic restart every %ss, "
+            "frozen detection after %ss of inactivity",
+            RESTART_INTERVAL, FROZEN_TIMEOUT
         )
 
         while self._watchdog_running:
             try:
-                # Sleep in short intervals so we can stop quickly
-                for _ in range(FROZEN_CHECK_INTERVAL):
-                    if not self._watchdog_running:
-                        return
-                    time.sleep(1)
+                self._watchdog_wait()
 
                 if not self._watchdog_running:
                     return
@@ -252,15 +339,13 @@ class RadioManager:
                     logger.warning("Radio process died unexpectedly, restarting...")
                     try:
                         # Clean up the dead process
-                        if hasattr(self, '_log_file') and self._log_file:
-                            self._log_file.close()
-                            self._log_file = None
+                        self._close_log_file()
                         self.process = None
                         self._last_start_time = None
                         time.sleep(2)
                         self.start()
                     except Exception as e:
-                        logger.error(f"Watchdog failed to restart after crash: {e}")
+                        logger.error("Watchdog failed to restart after crash: %s", e)
                     continue
 
                 if not self.is_running():
@@ -271,8 +356,8 @@ class RadioManager:
                     uptime = time.time() - self._last_start_time
                     if uptime >= RESTART_INTERVAL:
                         logger.info(
-                            f"Periodic restart triggered (uptime: {uptime:.0f}s / "
-                            f"{uptime / 3600:.1f}h)"
+                            "Periodic restart triggered (uptime: %.0fs / %.1fh)",
+                            uptime, uptime / 3600
                         )
                         self._do_watchdog_restart("periodic restart")
                         continue
@@ -283,9 +368,9 @@ class RadioManager:
                     self._do_watchdog_restart("frozen process detected")
 
             except Exception as e:
-                logger.error(f"Watchdog error: {e}", exc_info=True)
+                logger.error("Watchdog error: %s", e, exc_info=True)
                 # Don't let the watchdog die from an unexpected error
-                time.sleep(10)
+                self._watchdog_stop.wait(10)
 
     def _do_watchdog_restart(self, reason: str):
         """Perform a restart triggered by the watchdog.
@@ -294,12 +379,12 @@ class RadioManager:
             reason: Human-readable reason for the restart.
         """
         try:
-            logger.info(f"Watchdog restart reason: {reason}")
+            logger.info("Watchdog restart reason: %s", reason)
             self.stop(stop_watchdog=False)
             time.sleep(2)
             self.start()
         except Exception as e:
-            logger.error(f"Watchdog restart failed ({reason}): {e}")
+            logger.error("Watchdog restart failed (%s): %s", reason, e)
 
     def is_running(self) -> bool:
         """Check if the radio process is running.
@@ -332,11 +417,7 @@ class RadioManager:
             "uptime_seconds": uptime,
             "next_restart_seconds": next_restart,
             "watchdog_active": self._watchdog_running,
-            "config": {
-                "frequency": self.config["frequency"],
-                "gain": self.config["gain"],
-                "device_index": self.config.get("device_index", 0),
-            }
+            "config": self._config_snapshot,
         }
         return status
 
@@ -359,10 +440,14 @@ def start_radio():
     manager.start()
 
 
-def stop_radio():
-    """Stop the radio monitoring process."""
+def stop_radio(timeout: float = STOP_TIMEOUT):
+    """Stop the radio monitoring process.
+
+    Args:
+        timeout: Seconds to wait after SIGTERM before sending SIGKILL.
+    """
     manager = get_radio_manager()
-    manager.stop()
+    manager.stop(timeout=timeout)
 
 
 def restart_radio():
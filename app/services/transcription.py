@@ -1,5 +1,7 @@
 """Transcription service using Deepgram API."""
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
 import httpx
 from deepgram import DeepgramClient
 
@@ -8,22 +10,48 @@ from app.config import DEEPGRAM_API_KEY
 
 logger = logging.getLogger(__name__)
 
+HTTP_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+
+# Maximum Deepgram requests in flight when transcribing a batch of files
+MAX_CONCURRENT_TRANSCRIPTIONS = 8
+
+# Size of each chunk read from disk while streaming a WAV upload
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 # Deepgram client for transcription with custom timeout
 deepgram = DeepgramClient(
     api_key=DEEPGRAM_API_KEY,
-    httpx_client=httpx.Client(
-        timeout=httpx.Timeout(300.0, connect=10.0)
-    )
+    httpx_client=httpx.Client(timeout=HTTP_TIMEOUT)
+)
+
+# Workers for transcribe_many(); green threads once server.py monkey-patches,
+# so batch uploads share the eventlet hub instead of blocking it
+_TRANSCRIBE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_TRANSCRIPTIONS, thread_name_prefix="Transcribe"
 )
 
 
+class _FileChunks:
+    """Upload body that streams a file in chunks.
+
+    The Deepgram SDK retries failed requests with the same body object, so
+    every iteration reopens the file rather than resuming a used-up stream.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def __iter__(self):
+        with open(self.file_path, "rb") as file:
+            while chunk := file.read(UPLOAD_CHUNK_SIZE):
+                yield chunk
+
+
 def get_transcription(file_path):
     """Get transcription from Deepgram API."""
-    with open(file_path, "rb") as file:
-        buffer_data = file.read()
-
+    # Stream the file from disk rather than buffering the whole WAV in memory
     response = deepgram.listen.v1.media.transcribe_file(
-        request=buffer_data,
+        request=_FileChunks(file_path),
         model="nova-3",
         smart_format=True
     )
@@ -33,13 +61,45 @@ def get_transcription(file_path):
     return [response, transcript]
 
 
+def transcribe_to_row(file_path):
+    """Transcribe a file and return a (filename, transcript, json_response) row."""
+    [response, transcript] = get_transcription(file_path)
+    # Convert Pydantic model to JSON string
+    json_response = response.model_dump_json()
+    return (file_path, transcript, json_response)
+
+
 def save_transcription(file_path):
     """Transcribe a file and save the result."""
     try:
-        [response, transcript] = get_transcription(file_path)
-        # Convert Pydantic model to JSON string
-        json_response = response.model_dump_json()
-        save_transcript(file_path, transcript, json_response)
+        save_transcript(*transcribe_to_row(file_path))
         logger.info(f"Transcribed: {file_path}")
     except Exception as e:
         logger.error(f"Transcription failed for {file_path}: {e}", exc_info=True)
+
+
+def _try_transcribe_to_row(file_path):
+    """Transcribe a file into a row, logging and returning None on failure."""
+    try:
+        row = transcribe_to_row(file_path)
+    except Exception as e:
+        logger.error(f"Transcription failed for {file_path}: {e}", exc_info=True)
+        return None
+    logger.info(f"Transcribed: {file_path}")
+    return row
+
+
+def transcribe_many(file_paths):
+    """
+    Transcribe many files concurrently without saving them.
+
+    Args:
+        file_paths: List of file paths to transcribe
+
+    Returns:
+        List aligned with file_paths holding a (filename, transcript,
+        json_response) row per file, or None where transcription failed
+    """
+    if not file_paths:
+        return []
+    return list(_TRANSCRIBE_EXECUTOR.map(_try_transcribe_to_row, file_paths))
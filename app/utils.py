@@ -1,51 +1,90 @@
 """Utility functions for the application."""
 import os
+import atexit
+import hmac
 import logging
+import logging.handlers
 import json
-from datetime import datetime
-from functools import wraps
-from flask import request, redirect, url_for, make_response
+import queue
+import re
+import struct
+import time
+from functools import lru_cache, wraps
+from flask import g, request, redirect, url_for
 import wave
 import yaml
 
-from app.config import APP_PASSWORD
+from app.config import APP_PASSWORD, YAML_LOADER
 
 
+_APP_PASSWORD_BYTES = APP_PASSWORD.encode("utf-8")
+
 _login_logger = None
+_login_listener = None
 
 
 def get_login_logger():
-    """Get or create the login logger."""
-    global _login_logger
+    """Get or create the login logger.
+
+    Records are handed to a background QueueListener so request threads
+    never block on writing login.log.
+    """
+    global _login_logger, _login_listener
     if _login_logger is None:
         _login_logger = logging.getLogger("login_logger")
         if not _login_logger.handlers:
-            handler = logging.FileHandler("login.log")
+            file_handler = logging.FileHandler("login.log", delay=True)
             formatter = logging.Formatter('%(asctime)s %(message)s')
-            handler.setFormatter(formatter)
-            _login_logger.addHandler(handler)
+            file_handler.setFormatter(formatter)
+
+            log_queue = queue.SimpleQueue()
+            _login_logger.addHandler(logging.handlers.QueueHandler(log_queue))
             _login_logger.setLevel(logging.INFO)
+
+            _login_listener = logging.handlers.QueueListener(log_queue, file_handler)
+            _login_listener.start()
+            atexit.register(_login_listener.stop)
     return _login_logger
 
 
+@lru_cache(maxsize=128)
+def _json_quote(value: str) -> str:
+    """JSON-escape a string, caching results for repeated values like user agents."""
+    return json.dumps(value)
+
+
+def _matches_password(candidate: str | None) -> bool:
+    """Compare a candidate against the app password in constant time."""
+    return bool(candidate) and hmac.compare_digest(candidate.encode("utf-8"), _APP_PASSWORD_BYTES)
+
+
 def check_auth() -> bool:
     """Check if user has valid password cookie."""
-    cookie_pw = request.cookies.get("site_pw")
-    return cookie_pw == APP_PASSWORD
+    return _matches_password(request.cookies.get("site_pw"))
 
 
 def verify_password(password: str) -> bool:
     """Verify password is correct."""
-    return password == APP_PASSWORD
+    return _matches_password(password)
+
+
+@lru_cache(maxsize=128)
+def _login_url(next_path: str) -> str:
+    """Build the login URL that redirects back to next_path, memoized per path."""
+    return url_for('auth.login', next=next_path)
 
 
 def require_password(view_func):
     """Decorator to require password authentication."""
     @wraps(view_func)
     def wrapped_view(*args, **kwargs):
-        if check_auth():
+        # Check the cookie once per request, however many decorated views run
+        authed = getattr(g, "_authed", None)
+        if authed is None:
+            authed = g._authed = check_auth()
+        if authed:
             return view_func(*args, **kwargs)
-        return redirect(url_for('auth.login', next=request.path))
+        return redirect(_login_url(request.path))
     return wrapped_view
 
 
@@ -55,7 +94,7 @@ def log_login_attempt(success: bool, password: str = ""):
     ip = request.headers.get('X-Forwarded-For', request.remote_addr)
     user_agent = request.headers.get('User-Agent', '')
 
-    message = f"Login attempt: success={success} ip={ip} user_agent={json.dumps(user_agent)}"
+    message = f"Login attempt: success={success} ip={ip} user_agent={_json_quote(user_agent)}"
     if not success and password:
         message += f" attempted_password={json.dumps(password)}"
 
@@ -65,7 +104,7 @@ def log_login_attempt(success: bool, password: str = ""):
 def create_authenticated_response(next_url: str = None):
     """Create a response with authentication cookie."""
     next_url = next_url or url_for("files.index")
-    resp = make_response(redirect(next_url))
+    resp = redirect(next_url)
     resp.set_cookie("site_pw", APP_PASSWORD, max_age=60*60*24*30, httponly=True, samesite="Lax")
     return resp
 
@@ -92,41 +131,100 @@ def parse_time_from_filename(filename: str) -> str:
         else:
             return filename
 
-        recording_time = datetime.strptime(
-            f"{hours:02}:{minutes:02}:{seconds:02}", "%H:%M:%S"
-        )
-        return recording_time.strftime("%I:%M:%S %p")
+        # Reject out-of-range times, as strptime("%H:%M:%S") would
+        if not (0 <= hours <= 23 and 0 <= minutes <= 59 and 0 <= seconds <= 59):
+            return filename
+
+        # Format as 12-hour time, e.g. "08:02:14 PM"
+        hour12 = (hours + 11) % 12 + 1
+        am_pm = "AM" if hours < 12 else "PM"
+        return f"{hour12:02d}:{minutes:02d}:{seconds:02d} {am_pm}"
     except (ValueError, TypeError, IndexError):
         return filename
 
 
+# Leading YYYYMMDD_ timestamp with year 2000-2100, month 01-12 and day 01-31
+_DATE_RE = re.compile(r'(20[0-9]{2}|2100)(0[1-9]|1[0-2])(0[1-9]|[12][0-9]|3[01])_')
+
+
+def parse_date_from_filename(filename: str) -> str | None:
+    """
+    Extract date from filename timestamp.
+
+    Example: 20251113_200214_26522_DMR_CC_3_GROUP_TGT_1_SRC_1.wav
+    Returns: 20251113
+
+    Args:
+        filename: The filename to parse
+
+    Returns:
+        Date string in YYYYMMDD format or None if invalid
+    """
+    match = _DATE_RE.match(filename)
+    return match.group(0)[:8] if match else None
+
+
 def extract_radio_uid_from_filename(filename: str) -> int | None:
     """Extract radio unit ID from filename."""
     try:
-        basename = os.path.splitext(filename)[0]
-        radio_uid = basename.split("_")[-1]
+        stem, dot, _ = filename.rpartition(".")
+        radio_uid = (stem if dot else filename).rpartition("_")[2]
         return int(radio_uid) if radio_uid.isdigit() else None
-    except (ValueError, IndexError):
+    except ValueError:
         return None
 
 
+def _split_date(date_str: str) -> tuple[str, str, str] | None:
+    """Split a YYYYMMDD string into (year, month, day), or None if not 8 characters."""
+    if len(date_str) == 8:
+        return date_str[:4], date_str[4:6], date_str[6:]
+    return None
+
+
 def format_date_display(date_str: str) -> str:
     """Format date from YYYYMMDD to YYYY/MM/DD."""
-    if len(date_str) == 8:
-        return f"{date_str[:4]}/{date_str[4:6]}/{date_str[6:]}"
+    if parts := _split_date(date_str):
+        return "/".join(parts)
     return date_str
 
 
 def format_date_database(date_str: str) -> str:
     """Format date from YYYYMMDD to YYYY-MM-DD."""
-    if len(date_str) == 8:
-        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+    if parts := _split_date(date_str):
+        return "-".join(parts)
     return date_str
 
 
-def get_wav_length(file_path: str) -> float:
-    """Get the duration of a WAV file in seconds."""
+WAV_HEADER_SIZE = 44
+
+# Number of WAV durations kept by _read_wav_duration's LRU cache
+WAV_LENGTH_CACHE_SIZE = 50000
+
+
+@lru_cache(maxsize=WAV_LENGTH_CACHE_SIZE)
+def _read_wav_duration(file_path: str, file_size: int, mtime_ns: int) -> float:
+    """Read the duration of a WAV file in seconds from its header.
+
+    Cached on (path, size, mtime), so a rewritten file is read again.
+    Canonical 44-byte PCM headers (what dsd-fme writes) are parsed directly;
+    anything else is handed to the wave module.
+    """
     try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            header = os.read(fd, WAV_HEADER_SIZE)
+        finally:
+            os.close(fd)
+
+        if (len(header) == WAV_HEADER_SIZE and header[0:4] == b"RIFF"
+                and header[8:12] == b"WAVE" and header[12:16] == b"fmt "
+                and header[36:40] == b"data"):
+            audio_format, _, sample_rate, _, block_align, _ = struct.unpack_from("<HHIIHH", header, 20)
+            data_size = struct.unpack_from("<I", header, 40)[0]
+            if audio_format == 1 and sample_rate and block_align:
+                data_size = min(data_size, file_size - WAV_HEADER_SIZE)
+                return (data_size // block_align) / float(sample_rate)
+
         with wave.open(file_path, 'rb') as wav_file:
             frames = wav_file.getnframes()
             rate = wav_file.getframerate()
@@ -136,28 +234,55 @@ def get_wav_length(file_path: str) -> float:
         return 0.0
 
 
-# ID Mapping
-_unit_config_cache = None
+def get_wav_length(file_path: str, stat_result: os.stat_result | None = None) -> float:
+    """Get the duration of a WAV file in seconds.
 
+    Results are cached per file and invalidated when its mtime or size changes.
+    Pass ``stat_result`` (e.g. from ``os.DirEntry.stat()``) to skip the stat call.
+    """
+    try:
+        st = stat_result if stat_result is not None else os.stat(file_path)
+    except OSError:
+        return 0.0
 
-def _load_unit_config() -> dict:
-    """Load unit configuration from YAML file with caching."""
-    global _unit_config_cache
-    if _unit_config_cache is None:
-        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
-        try:
-            with open(config_path, 'r') as f:
-                # Load config and convert keys to integers
-                config = yaml.safe_load(f)
-                units = config.get("units", {})
-                _unit_config_cache = {int(k): v for k, v in units.items()}
-        except (FileNotFoundError, yaml.YAMLError) as e:
-            logging.warning(f"Failed to load config.yaml for units: {e}")
-            _unit_config_cache = {}
-    return _unit_config_cache
+    return _read_wav_duration(file_path, st.st_size, st.st_mtime_ns)
+
+
+# ID Mapping
+# Unit ID -> name map, reloaded when config.yaml changes on disk
+UNIT_MAP_CHECK_INTERVAL = 5  # seconds between config.yaml mtime checks
+_UNIT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
+_UNIT_MAP: dict[int, str] = {}
+_UNIT_MAP_MTIME = None
+_unit_map_checked_at = None
+
+
+def _maybe_reload_unit_map():
+    """Reload the unit map if config.yaml changed, checking at most every few seconds."""
+    global _UNIT_MAP, _UNIT_MAP_MTIME, _unit_map_checked_at
+    now = time.monotonic()
+    if _unit_map_checked_at is not None and now - _unit_map_checked_at < UNIT_MAP_CHECK_INTERVAL:
+        return
+    _unit_map_checked_at = now
+
+    try:
+        mtime = os.path.getmtime(_UNIT_CONFIG_PATH)
+        if mtime == _UNIT_MAP_MTIME:
+            return
+        with open(_UNIT_CONFIG_PATH, 'r') as f:
+            # Load config and convert keys to integers
+            # An empty or half-written file parses as None
+            config = yaml.load(f, Loader=YAML_LOADER)
+            units = (config or {}).get("units") or {}
+            _UNIT_MAP = {int(k): v for k, v in units.items()}
+        _UNIT_MAP_MTIME = mtime
+    except Exception as e:
+        # Keep serving the previously loaded map; a malformed file (e.g. a
+        # non-integer unit ID) must not break recording processing or listings
+        logging.warning(f"Failed to load config.yaml for units: {e}")
 
 
 def get_unit_info(unit_id: int) -> str:
     """Map radio unit ID to unit name from config file."""
-    unit_map = _load_unit_config()
-    return unit_map.get(unit_id, f"Unknown. Radio ID: {unit_id}")
+    _maybe_reload_unit_map()
+    return _UNIT_MAP.get(unit_id, f"Unknown. Radio ID: {unit_id}")
@@ -1,59 +1,173 @@
 """Main Flask application for radio recording server."""
+# Patch the standard library before anything imports socket/threading, so
+# every thread and blocking call cooperates with the eventlet hub
+import eventlet
+eventlet.monkey_patch()
+
 import os
 import sys
 import logging
+import logging.handlers
+import queue
 import signal
 import atexit
-from flask import Flask
+import orjson
+from flask import Flask, render_template
+from flask_caching import Cache
+from flask_compress import Compress
 from flask_socketio import SocketIO
 
 import app.models as models
 import app.services.file_organizer as file_organizer
+import app.services.observer as observer
 import app.services.radio_manager as radio_manager
 from app.routes import setup_routes
-from app.config import APP_PASSWORD
+from app.config import APP_PASSWORD, BRANDING
+
+
+# Create folders (one directory listing instead of a mkdir attempt per folder)
+with os.scandir(".") as entries:
+    existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+for folder in ("logs", "temp", "files"):
+    if folder not in existing_dirs:
+        os.mkdir(folder)
+
+
+# Buffer size for logs/server.log, so bursts of records reach disk in one write
+LOG_BUFFER_SIZE = 64 * 1024
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to its caller instead of every record."""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs dry."""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
 
+class OrjsonSerializer:
+    """json-module compatible wrapper so Socket.IO packets are encoded by orjson."""
 
-# Create folders
-os.makedirs("logs", exist_ok=True)
-os.makedirs("temp", exist_ok=True)
-os.makedirs("files", exist_ok=True)
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # orjson always emits compact output, which is what Socket.IO asks for
+        return orjson.dumps(obj).decode()
 
+    @staticmethod
+    def loads(data, **kwargs):
+        return orjson.loads(data)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Configure logging: callers only enqueue records, and a background listener
+# writes them to stderr and logs/server.log
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_file_handler = BufferedStreamHandler(
+    open("logs/server.log", "a", buffering=LOG_BUFFER_SIZE, encoding="utf-8")
 )
+log_handlers = [logging.StreamHandler(), log_file_handler]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+root_logger = logging.getLogger()
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+root_logger.setLevel(logging.INFO)
+
+log_listener = FlushingQueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+# atexit runs these last-registered-first: cleanup_handler logs, then the
+# listener drains the queue, then whatever is still buffered is written
+atexit.register(log_file_handler.flush)
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
-# Create Flask app
-app = Flask(__name__)
-socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*")
+# Create Flask app (there are no static assets; recordings are served by /play)
+app = Flask(__name__, static_folder=None)
+# Let browsers reuse files sent via send_file/send_from_directory for an hour
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+# Compress HTML/JSON pages (recordings are sent as files and pass through as-is)
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+
+# Engine.IO compresses long-polling payloads itself; match the page threshold
+socketio = SocketIO(
+    app,
+    async_mode='eventlet',
+    cors_allowed_origins="*",
+    http_compression=True,
+    compression_threshold=500,
+    json=OrjsonSerializer,
+    # Idle pages only need a heartbeat every minute (still inside the ~100s
+    # idle timeout of tunnels/proxies in front of the server)
+    ping_interval=60,
+    ping_timeout=120,
+    logger=False,
+    engineio_logger=False
+)
 
 # Set up socketio for file organizer
 file_organizer.set_socketio(socketio)
 
 # Register routes and blueprints (use "files" as the record folder)
-setup_routes(app, "files")
+setup_routes(app, "files", cache)
+
+# Compile every template now so the first request for each page doesn't pay for it
+TEMPLATES = ("404.html", "index.html", "files.html", "login.html", "search_results.html")
+for template_name in TEMPLATES:
+    app.jinja_env.get_template(template_name)
+
+# The 404 page only depends on the branding, which is fixed at startup
+with app.app_context():
+    RENDERED_404 = render_template('404.html', branding=BRANDING)
 
 # Error handlers
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors."""
-    from flask import render_template
-    from app.config import BRANDING
-    return render_template('404.html', branding=BRANDING), 404
+    return RENDERED_404, 404
+
+
+# Set once cleanup has run; a signal runs it and then atexit calls it again
+_cleaned = False
 
 
 def cleanup_handler():
-    """Cleanup handler to stop radio process on exit."""
+    """Cleanup handler to stop the radio process and file observer on exit."""
+    global _cleaned
+    if _cleaned:
+        return
+    _cleaned = True
+
     logger.info("Shutting down... stopping radio process")
     try:
-        radio_manager.stop_radio()
+        # Keep shutdown short: force kill dsd-fme if it ignores SIGTERM
+        radio_manager.stop_radio(timeout=2.0)
     except Exception as e:
         logger.error(f"Error stopping radio process during cleanup: {e}")
 
+    try:
+        observer.stop_observer()
+    except Exception as e:
+        logger.error(f"Error stopping file observer during cleanup: {e}")
+
 
 def signal_handler(signum, frame):
     """Handle interrupt signals gracefully."""
@@ -68,9 +182,13 @@ def initialize_app():
     models.init_db()
     logger.info("Database initialized")
 
-    # Start file organizer
-    file_organizer.start_organizer_thread()
-    logger.info("File organizer started")
+    # Start file organizer as a hub-aware task, so organizing the existing
+    # backlog doesn't hold up startup
+    socketio.start_background_task(
+        file_organizer.start_organizer_thread,
+        file_organizer.BatchConfig(batch_size=50, flush_ms=500)
+    )
+    logger.info("File organizer starting in background")
 
     # Start radio monitoring process
     try:
@@ -82,7 +200,7 @@ def initialize_app():
         logger.error("Server will continue without radio monitoring. Please check your configuration and dsd-fme installation.")
 
 
-# Register cleanup handlers
+# Register cleanup handlers before anything below starts the radio process
 atexit.register(cleanup_handler)
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)